@@ -1,8 +1,10 @@
 from abc import ABCMeta
-from functools import lru_cache, wraps
+from collections import deque
+from functools import wraps
 from inspect import signature, iscoroutinefunction
 from types import LambdaType, FunctionType, MethodType
-from typing import TypeVar, Type, List, Any, Callable, Dict, Optional, Tuple, Set
+from typing import TypeVar, Type, Any, Callable, Dict, Optional, Tuple, Set, Sequence
+from weakref import WeakKeyDictionary
 
 __all__ = [
     'Injector',
@@ -13,14 +15,42 @@ __all__ = [
     'ClassInjection',
     'LambdaInjection',
     'FunctionInjection',
-    'SequenceInjection'
+    'SequenceInjection',
+    'TRANSIENT',
+    'SINGLETON'
 ]
 
 T = TypeVar('T')
 
 Token = Type[T]
 
-DependencyPath = List[Tuple[int, Callable]]
+DependencyPath = Tuple[Tuple[Token, ...], Tuple[Optional['Injection'], ...], Tuple[int, ...]]
+
+TRANSIENT = 'transient'
+
+SINGLETON = 'singleton'
+
+_MISSING = object()
+
+_SEQUENCE_DATA_TYPES = {list: list, tuple: tuple, set: set}
+
+_CLASS_INGREDIENTS: 'WeakKeyDictionary[type, Tuple[Token, ...]]' = WeakKeyDictionary()
+
+_FUNCTION_INGREDIENTS: 'WeakKeyDictionary[FunctionType, Tuple[Token, ...]]' = WeakKeyDictionary()
+
+_WRAPPER_FACTORIES: Dict[Tuple[int, bool], Callable] = {}
+
+_DELIVERY_FACTORIES: Dict[Tuple[bool, Tuple[Tuple[str, int], ...]], Callable] = {}
+
+_VALUE_EXPRESSION = '{name}'
+
+_CALL_EXPRESSION = '{name}({arguments})'
+
+_DELIVER_EXPRESSION = '{name}(({arguments}))'
+
+_SINGLETON_EXPRESSION = '_singletons[{name}] if {name} in _singletons else _deliver_token({name}, _strict)'
+
+_SEQUENCE_EXPRESSIONS = {list: '[{arguments}]', tuple: '({arguments})', set: '{{{arguments}}}'}
 
 
 class DependencyInjectionError(Exception):
@@ -36,15 +66,16 @@ class DeliveryError(DependencyInjectionError):
 
 
 class Injection(metaclass=ABCMeta):
+    __slots__ = ()
 
     @property
-    def ingredients(self) -> List[Token]:
+    def ingredients(self) -> Tuple[Token, ...]:
         """
-        A list of `DependencyToken`s which need to be resolved by the `Injector` before deliver.
+        A tuple of `DependencyToken`s which need to be resolved by the `Injector` before deliver.
         """
         raise NotImplementedError()
 
-    def deliver(self, dependencies: List) -> Any:
+    def deliver(self, dependencies: Tuple) -> Any:
         raise NotImplementedError()
 
 
@@ -52,15 +83,14 @@ class ValueInjection(Injection):
     """
     Configures the `Injector` to return a value for a dependency token.
     """
+    __slots__ = ('_value',)
+
+    ingredients = ()
 
     def __init__(self, value: Any):
         self._value = value
 
-    @property
-    def ingredients(self) -> List[Token]:
-        return []
-
-    def deliver(self, dependencies: List) -> Any:
+    def deliver(self, dependencies: Tuple) -> Any:
         return self._value
 
 
@@ -68,21 +98,21 @@ class ClassInjection(Injection):
     """
     Configures the `Injector` to return an instance of class for a dependency token.
     """
+    __slots__ = ('_class', 'ingredients')
 
     def __init__(self, _class: Type):
         self._class = _class
-
-    @property
-    def ingredients(self) -> List[Token]:
-        init_function = self._class.__init__
-        if init_function is object.__init__:
-            return []
-        else:
-            references = init_function.__annotations__.items()
-            tokens = [token for name, token in references if name != 'return']
-            return tokens
-
-    def deliver(self, dependencies: List) -> Any:
+        ingredients = _CLASS_INGREDIENTS.get(_class)
+        if ingredients is None:
+            init_function = _class.__init__
+            if init_function is object.__init__:
+                ingredients = ()
+            else:
+                ingredients = _read_ingredients(init_function)
+            _CLASS_INGREDIENTS[_class] = ingredients
+        self.ingredients = ingredients
+
+    def deliver(self, dependencies: Tuple) -> Any:
         return self._class(*dependencies)
 
 
@@ -90,15 +120,14 @@ class LambdaInjection(Injection):
     """
     Configures the `Injector` to return a dependency by invoking lambda.
     """
+    __slots__ = ('_lambda',)
+
+    ingredients = ()
 
     def __init__(self, _lambda: LambdaType):
         self._lambda = _lambda
 
-    @property
-    def ingredients(self) -> List[Token]:
-        return []
-
-    def deliver(self, dependencies: List) -> Any:
+    def deliver(self, dependencies: Tuple) -> Any:
         return self._lambda()
 
 
@@ -106,17 +135,21 @@ class FunctionInjection(Injection):
     """
     Configures the `Injector` to return a dependency by invoking function or bound method.
     """
+    __slots__ = ('_function', 'ingredients')
 
     def __init__(self, function: Callable):
         self._function = function
+        key = getattr(function, '__func__', function)
+        if isinstance(key, FunctionType):
+            ingredients = _FUNCTION_INGREDIENTS.get(key)
+            if ingredients is None:
+                ingredients = _read_ingredients(function)
+                _FUNCTION_INGREDIENTS[key] = ingredients
+        else:
+            ingredients = _read_ingredients(function)
+        self.ingredients = ingredients
 
-    @property
-    def ingredients(self) -> List[Token]:
-        references = self._function.__annotations__.items()
-        tokens = [token for name, token in references if name != 'return']
-        return tokens
-
-    def deliver(self, dependencies: List) -> Any:
+    def deliver(self, dependencies: Tuple) -> Any:
         return self._function(*dependencies)
 
 
@@ -124,65 +157,62 @@ class SequenceInjection(Injection):
     """
     Configures the `Injector` to return collection of dependencies.
     """
+    __slots__ = ('_tokens', '_sequence_data_type', 'ingredients')
 
-    def __init__(self, sequence_data_type, tokens: List[Token]):
-        self._tokens = tokens
+    def __init__(self, sequence_data_type, tokens: Sequence[Token]):
+        self._tokens = tuple(tokens)
         self._sequence_data_type = sequence_data_type
+        self.ingredients = self._tokens
 
-    @property
-    def ingredients(self) -> List[Token]:
-        return self._tokens
-
-    def deliver(self, dependencies: List) -> Any:
+    def deliver(self, dependencies: Tuple) -> Any:
         return self._sequence_data_type(dependencies)
 
 
 class Injector:
 
-    def __init__(self, cache=None):
+    def __init__(self):
         self._injections: Dict[Token, Injection] = {}
-        if cache is None:
-            cache = lru_cache()
-        self._find_path_method = cache(self._find_path)
+        # first prepared object of equal tokens is used as canonical key of identity indexes
+        self._tokens: Dict[Token, Token] = {}
+        self._injections_by_id: Dict[int, Injection] = {}
+        self._singleton_tokens: Set[Token] = set()
+        self._singletons: Dict[Token, Any] = {}
+        self._singleton_dependencies: Dict[Token, Tuple[Token, ...]] = {}
+        self._deliveries: Dict[Tuple[int, bool], Callable[[], Any]] = {}
 
     def create(self) -> 'Injector':
         """
         Creates a new Injector which contains all prepared injections.
-        Can be used to organize dependency scopes.
+        Can be used to organize dependency scopes, singleton instances are not shared with the new Injector.
         """
         injector = Injector()
         injector._injections = self._injections.copy()
+        injector._tokens = self._tokens.copy()
+        injector._injections_by_id = self._injections_by_id.copy()
+        injector._singleton_tokens = self._singleton_tokens.copy()
         return injector
 
     def inject(self, target: Callable, skip=0, strict=True):
-        def _resolve_args(*args):
-            parameters = list(signature(target).parameters.values())[skip:]
-            dependencies = tuple(self.deliver(p.annotation, strict) for p in parameters)
-            args = args + dependencies
-            return args
+        parameters = list(signature(target).parameters.values())[skip:]
+        tokens = tuple(parameter.annotation for parameter in parameters)
+        is_coroutine = iscoroutinefunction(target)
 
-        @wraps(target)
-        def wrapper(*args, **kwargs):
-            return target(*_resolve_args(*args), **kwargs)
+        key = (len(tokens), is_coroutine)
+        factory = _WRAPPER_FACTORIES.get(key)
+        if factory is None:
+            factory = _compile_wrapper_factory(len(tokens), is_coroutine)
+            _WRAPPER_FACTORIES[key] = factory
 
-        @wraps(target)
-        async def async_wrapper(*args, **kwargs):
-            return await target(*_resolve_args(*args), **kwargs)
+        return wraps(target)(factory(target, self.deliver, strict, *tokens))
 
-        return async_wrapper if iscoroutinefunction(target) else wrapper
+    def prepare(self, token: Token, value: Any = None, scope=TRANSIENT) -> None:
+        sequence_data_type = _find_sequence_data_type(token)
 
-    def prepare(self, token: Token, value: Any = None) -> None:
         if isinstance(value, Injection):
             injection = value
 
-        elif hasattr(token, '__origin__') and issubclass(token.__origin__, List):
-            injection = SequenceInjection(list, value)
-
-        elif hasattr(token, '__origin__') and issubclass(token.__origin__, Tuple):
-            injection = SequenceInjection(tuple, value)
-
-        elif hasattr(token, '__origin__') and issubclass(token.__origin__, Set):
-            injection = SequenceInjection(set, value)
+        elif sequence_data_type is not None:
+            injection = SequenceInjection(sequence_data_type, value)
 
         elif isinstance(value, type):
             injection = ClassInjection(value)
@@ -212,15 +242,43 @@ class Injector:
         else:
             injection = ValueInjection(value)
 
-        self.prepare_injection(token, injection)
+        self.prepare_injection(token, injection, scope)
 
-    def prepare_injection(self, token: Token, injection: Injection) -> None:
+    def prepare_injection(self, token: Token, injection: Injection, scope=TRANSIENT) -> None:
+        """
+        :param token: Dependency class used as token.
+        :param injection: Injection which delivers dependency.
+        :param scope: Singleton scope makes Injector deliver one instance for all requests of the token.
+        """
         if not isinstance(injection, Injection):
             raise PreparationError(
                 f'Unable to prepare token={token} injection, '
                 f'argument must be instance of Injection class'
             )
-        self._injections[token] = injection
+        if scope == SINGLETON:
+            self._singleton_tokens.add(token)
+        elif scope == TRANSIENT:
+            self._singleton_tokens.discard(token)
+        else:
+            raise PreparationError(
+                f'Unable to prepare token={token} injection, '
+                f'scope must be {TRANSIENT!r} or {SINGLETON!r}'
+            )
+        canonical = self._tokens.setdefault(token, token)
+        self._injections[canonical] = injection
+        self._injections_by_id[id(canonical)] = injection
+        self._drop_singletons(token)
+        self._deliveries.clear()
+
+    def finalize(self) -> None:
+        """
+        Compiles deliveries of all prepared tokens in advance.
+        Raises `DeliveryError` if some dependency is not prepared.
+        """
+        for token in self._injections:
+            key = (id(token), True)
+            if key not in self._deliveries:
+                self._deliveries[key] = self._compile(token, True)
 
     def deliver(self, token: Token, strict=True) -> Optional[T]:
         """
@@ -228,35 +286,202 @@ class Injector:
         :param strict: Strict mode eliminates dependency configuration silent errors by changing them to exceptions.
         :return: An instance of dependency based on the specified 'token'.
         """
-        path = self._find_path_method(token, strict)
-        instances = []
-        index = 0
-        for argn, deliver in reversed(path):
-            instances.append(deliver(reversed(instances[index:index + argn])))
-            index += argn
-        return instances[-1]
+        try:
+            injection = self._injections_by_id[id(token)]
+        except KeyError:
+            # equal token may be built again, like list[T], so canonical key object is used instead
+            token = self._tokens.get(token, token)
+            injection = self._injections_by_id.get(id(token))
+            if injection is None:
+                # not cached, identity of not prepared token can be reused after garbage collection
+                return self._compile(token, strict)()
+        if injection.__class__ is ValueInjection:
+            return injection._value
+        if injection.__class__ is LambdaInjection and token not in self._singleton_tokens:
+            return injection._lambda()
+
+        key = (id(token), strict)
+        try:
+            deliver = self._deliveries[key]
+        except KeyError:
+            deliver = self._compile(token, strict)
+            self._deliveries[key] = deliver
+        return deliver()
+
+    def _drop_singletons(self, token: Token) -> None:
+        """
+        Drops singleton instances of the token and all singletons delivered with it,
+        so they are created again with the new preparation.
+        """
+        stale = [token]
+        while stale:
+            dependency = stale.pop()
+            self._singletons.pop(dependency, None)
+            self._singleton_dependencies.pop(dependency, None)
+            for singleton, dependencies in list(self._singleton_dependencies.items()):
+                if dependency in dependencies:
+                    stale.append(singleton)
+
+    def _compile(self, token: Token, strict=True) -> Callable[[], Any]:
+        """
+        Generates a function which delivers dependency by straight calls of injections.
+        This function is cached until the next preparation to increase delivery speed.
+        """
+        tokens, injections, argcounts = self._find_path(token, strict)
+        is_singleton = token in self._singleton_tokens
+        if is_singleton:
+            self._singleton_dependencies[token] = tokens
+        expressions = []
+        bindings = [self.deliver, self._singletons, strict, _MISSING, token]
+        for dependency, injection, argn in zip(tokens, injections, argcounts):
+            if injection is not None:
+                template, binding = self._find_expression(injection, argn)
+            elif dependency in self._singleton_tokens:
+                template, binding = _SINGLETON_EXPRESSION, dependency
+            else:
+                template, binding = _VALUE_EXPRESSION, None
+            expressions.append((template, argn))
+            bindings.append(binding)
+
+        # generated code depends only on dependency graph shape and is shared by all injectors
+        shape = (is_singleton, tuple(expressions))
+        factory = _DELIVERY_FACTORIES.get(shape)
+        if factory is None:
+            factory = _compile_delivery_factory(*shape)
+            _DELIVERY_FACTORIES[shape] = factory
+        return factory(tuple(bindings))
+
+    @staticmethod
+    def _find_expression(injection: Injection, argn: int) -> Tuple[str, Any]:
+        """
+        Returns a template of expression which delivers dependency by the injection and an object used by it.
+        Built-in injections are inlined to skip deliver method call and arguments packing.
+        """
+        injection_class = injection.__class__
+        if injection_class is ValueInjection:
+            return _VALUE_EXPRESSION, injection._value
+        if injection_class is LambdaInjection:
+            return _CALL_EXPRESSION, injection._lambda
+        if injection_class is ClassInjection:
+            return _CALL_EXPRESSION, injection._class
+        if injection_class is FunctionInjection:
+            return _CALL_EXPRESSION, injection._function
+        if injection_class is SequenceInjection and argn:
+            template = _SEQUENCE_EXPRESSIONS.get(injection._sequence_data_type)
+            if template is not None:
+                return template, None
+        return _DELIVER_EXPRESSION, injection.deliver
 
     def _find_path(self, token: Token, strict=True) -> DependencyPath:
         """
-        Converts dependency definitions into a flat array of resolved injection deliver methods.
-        This path can be cached to increase delivery speed.
+        Converts dependency definitions into flat arrays of tokens, resolved injections
+        and their argument counts in order of delivery.
         """
-        path = []
-        queue = [token]
+        tokens = []
+        injections = []
+        argcounts = []
+        queue = deque([token])
         while queue:
-            token = queue.pop(0)
-            injection = self._injections.get(token, None)
-            if injection is None:
-                if strict:
-                    raise DeliveryError(
-                        f'Dependency injection token={token} not configured,'
-                        f'try Injector.prepare before deliver'
-                    )
-                path.append((0, None))
+            token = queue.popleft()
+            try:
+                injection = self._injections_by_id[id(token)]
+            except KeyError:
+                injection = self._injections.get(token)
+                if injection is None:
+                    if strict:
+                        raise DeliveryError(
+                            f'Dependency injection token={token} not configured,'
+                            f'try Injector.prepare before deliver'
+                        ) from None
+                    tokens.append(token)
+                    injections.append(None)
+                    argcounts.append(0)
+                    continue
+
+            if tokens and token in self._singleton_tokens:
+                tokens.append(token)
+                injections.append(None)
+                argcounts.append(0)
+                continue
 
             ingredients = injection.ingredients
-            path.append((len(ingredients), injection.deliver))
+            tokens.append(token)
+            injections.append(injection)
+            argcounts.append(len(ingredients))
             for ingredient in ingredients:
                 queue.append(ingredient)
 
-        return path
+        return tuple(reversed(tokens)), tuple(reversed(injections)), tuple(reversed(argcounts))
+
+
+def _compile_delivery_factory(is_singleton: bool, expressions: Tuple[Tuple[str, int], ...]) -> Callable:
+    """
+    Generates a factory of `Injector` deliver functions for dependency graph of the specified shape.
+    Each expression is a template of dependency delivery and number of its arguments in order of delivery.
+    """
+    names = ['_deliver_token', '_singletons', '_strict', '_MISSING', '_root']
+    lines = []
+    root = len(expressions) - 1
+    if is_singleton:
+        lines.append(f'_i{root} = _singletons.get(_root, _MISSING)')
+        lines.append(f'if _i{root} is not _MISSING:')
+        lines.append(f'    return _i{root}')
+    index = 0
+    for number, (template, argn) in enumerate(expressions):
+        names.append(f'_d{number}')
+        arguments = ''.join(f'_i{i}, ' for i in range(index + argn - 1, index - 1, -1))
+        lines.append(f'_i{number} = ' + template.format(name=f'_d{number}', arguments=arguments))
+        index += argn
+    if is_singleton:
+        lines.append(f'_singletons[_root] = _i{root}')
+    lines.append(f'return _i{root}')
+
+    # names are unpacked from one tuple into closure variables,
+    # arguments or defaults are limited to 255 in Python 3.6
+    source = (
+        f'def _factory(_bindings):\n'
+        f'    {", ".join(names)}, = _bindings\n'
+        f'    def _deliver():\n'
+        + ''.join(f'        {line}\n' for line in lines) +
+        f'    return _deliver\n'
+    )
+    namespace = {}
+    exec(compile(source, '<botox>', 'exec'), namespace)
+    return namespace['_factory']
+
+
+def _compile_wrapper_factory(count: int, is_coroutine: bool) -> Callable:
+    """
+    Generates a factory of `Injector.inject` wrappers which append `count` delivered dependencies to call arguments.
+    """
+    tokens = ''.join(f'_t{i}, ' for i in range(count))
+    dependencies = ''.join(f'_deliver(_t{i}, _strict), ' for i in range(count))
+    source = (
+        f'def _factory(_target, _deliver, _strict, {tokens}):\n'
+        f'    {"async " if is_coroutine else ""}def _wrapper(*args, **kwargs):\n'
+        f'        return {"await " if is_coroutine else ""}_target(*args, {dependencies}**kwargs)\n'
+        f'    return _wrapper\n'
+    )
+    namespace = {}
+    exec(compile(source, '<botox>', 'exec'), namespace)
+    return namespace['_factory']
+
+
+def _read_ingredients(function: Callable) -> Tuple[Token, ...]:
+    """
+    Returns tokens of annotated function arguments.
+    """
+    references = function.__annotations__.items()
+    return tuple(token for name, token in references if name != 'return')
+
+
+def _find_sequence_data_type(token: Token) -> Optional[Type]:
+    """
+    Returns a built-in sequence data type of generic token like `List[T]` or None for other tokens.
+    """
+    origin = getattr(token, '__origin__', None)
+    for base in getattr(origin, '__mro__', ()):
+        sequence_data_type = _SEQUENCE_DATA_TYPES.get(base)
+        if sequence_data_type is not None:
+            return sequence_data_type
+    return None
@@ -1,10 +1,11 @@
 import asyncio
 import inspect
+import sys
 import unittest
 from abc import ABCMeta
-from typing import List, Tuple, Set, Generic, TypeVar
+from typing import List, Tuple, Set, Generic, TypeVar, Optional
 
-from botox import Injector, DeliveryError, PreparationError, SequenceInjection
+from botox import Injector, DeliveryError, PreparationError, SequenceInjection, SINGLETON
 
 
 class TestValueInjection(unittest.TestCase):
@@ -20,6 +21,14 @@ class TestValueInjection(unittest.TestCase):
 
         self.assertIs(singleton, injector.deliver(MyService))
 
+    def test_should_deliver_new_value_when_token_prepared_again(self):
+        injector = Injector()
+        injector.prepare(str, 'alice')
+        self.assertEqual('alice', injector.deliver(str))
+
+        injector.prepare(str, 'boris')
+        self.assertEqual('boris', injector.deliver(str))
+
 
 class TestLambdaInjection(unittest.TestCase):
 
@@ -206,6 +215,38 @@ class TestClassInjection(unittest.TestCase):
         with self.assertRaises(DeliveryError):
             injector.deliver(MyFacade)
 
+    def test_should_deliver_class_instance_when_token_is_generic_but_not_sequence(self):
+        class MyService:
+            pass
+
+        injector = Injector()
+        injector.prepare(Optional[MyService], MyService)
+
+        self.assertIsInstance(injector.deliver(Optional[MyService]), MyService)
+
+    def test_should_deliver_none_dependency_when_not_prepared_and_not_strict(self):
+        class MyService:
+            pass
+
+        class MyFacade:
+            def __init__(self, service: MyService):
+                self.service = service
+
+        injector = Injector()
+        injector.prepare(MyFacade)
+
+        facade = injector.deliver(MyFacade, strict=False)
+        self.assertIsInstance(facade, MyFacade)
+        self.assertIsNone(facade.service)
+
+    def test_should_deliver_none_when_token_not_prepared_and_not_strict(self):
+        class MyService:
+            pass
+
+        injector = Injector()
+
+        self.assertIsNone(injector.deliver(MyService, strict=False))
+
 
 class TestFunctionInjection(unittest.TestCase):
 
@@ -310,6 +351,211 @@ class TestInjectorCreation(unittest.TestCase):
         self.assertEqual('alice', parent.deliver(str))
         self.assertEqual('boris', child.deliver(str))
 
+    def test_should_deliver_scoped_dependencies_when_graph_is_same(self):
+        class Request:
+            pass
+
+        class MyService:
+            def __init__(self, request: Request):
+                self.request = request
+
+        class MyFacade:
+            def __init__(self, service: MyService, request: Request):
+                self.service = service
+                self.request = request
+
+        root = Injector()
+        root.prepare(MyService)
+        root.prepare(MyFacade)
+
+        for _ in range(2):
+            request = Request()
+            scope = root.create()
+            scope.prepare(Request, request)
+
+            facade = scope.deliver(MyFacade)
+            self.assertIs(request, facade.request)
+            self.assertIs(request, facade.service.request)
+
+
+class TestSingletonScope(unittest.TestCase):
+
+    def test_should_deliver_same_instance_when_singleton(self):
+        class MyService:
+            pass
+
+        injector = Injector()
+        injector.prepare(MyService, scope=SINGLETON)
+
+        self.assertIs(injector.deliver(MyService), injector.deliver(MyService))
+
+    def test_should_share_singleton_dependency(self):
+        class MyRepository:
+            pass
+
+        class MyService:
+            def __init__(self, repository: MyRepository):
+                self.repository = repository
+
+        class MyFacade:
+            def __init__(self, service: MyService, repository: MyRepository):
+                self.service = service
+                self.repository = repository
+
+        injector = Injector()
+        injector.prepare(MyRepository, scope=SINGLETON)
+        injector.prepare(MyService)
+        injector.prepare(MyFacade)
+
+        a = injector.deliver(MyFacade)
+        b = injector.deliver(MyFacade)
+        self.assertIsNot(a, b)
+        self.assertIsNot(a.service, b.service)
+        self.assertIs(a.repository, a.service.repository)
+        self.assertIs(a.repository, b.repository)
+
+    def test_should_deliver_new_instance_when_singleton_prepared_again(self):
+        class MyService:
+            pass
+
+        injector = Injector()
+        injector.prepare(MyService, scope=SINGLETON)
+        a = injector.deliver(MyService)
+
+        injector.prepare(MyService, scope=SINGLETON)
+        b = injector.deliver(MyService)
+
+        self.assertIsNot(a, b)
+        self.assertIs(b, injector.deliver(MyService))
+
+    def test_should_deliver_new_dependent_singleton_when_singleton_prepared_again(self):
+        class Database:
+            pass
+
+        class DatabaseStub(Database):
+            pass
+
+        class Repository:
+            def __init__(self, database: Database):
+                self.database = database
+
+        injector = Injector()
+        injector.prepare(Database, scope=SINGLETON)
+        injector.prepare(Repository, scope=SINGLETON)
+        self.assertNotIsInstance(injector.deliver(Repository).database, DatabaseStub)
+
+        injector.prepare(Database, DatabaseStub, scope=SINGLETON)
+
+        database = injector.deliver(Database)
+        self.assertIsInstance(database, DatabaseStub)
+        self.assertIs(database, injector.deliver(Repository).database)
+
+    def test_should_deliver_same_singleton_when_other_token_prepared(self):
+        class Database:
+            pass
+
+        class Repository:
+            def __init__(self, database: Database):
+                self.database = database
+
+        class OtherService:
+            pass
+
+        injector = Injector()
+        injector.prepare(Database, scope=SINGLETON)
+        injector.prepare(Repository, scope=SINGLETON)
+        database = injector.deliver(Database)
+        repository = injector.deliver(Repository)
+
+        injector.prepare(OtherService)
+
+        self.assertIs(database, injector.deliver(Database))
+        self.assertIs(repository, injector.deliver(Repository))
+        self.assertIs(database, injector.deliver(Repository).database)
+
+    def test_should_deliver_new_transitive_singleton_when_singleton_prepared_again(self):
+        class Database:
+            pass
+
+        class DatabaseStub(Database):
+            pass
+
+        class Repository:
+            def __init__(self, database: Database):
+                self.database = database
+
+        class MyService:
+            def __init__(self, repository: Repository):
+                self.repository = repository
+
+        injector = Injector()
+        injector.prepare(Database, scope=SINGLETON)
+        injector.prepare(Repository, scope=SINGLETON)
+        injector.prepare(MyService, scope=SINGLETON)
+        injector.deliver(MyService)
+
+        injector.prepare(Database, DatabaseStub, scope=SINGLETON)
+
+        self.assertIsInstance(injector.deliver(MyService).repository.database, DatabaseStub)
+        self.assertIs(injector.deliver(Database), injector.deliver(MyService).repository.database)
+
+    def test_should_not_share_singleton_with_created_injector(self):
+        class MyService:
+            pass
+
+        parent = Injector()
+        parent.prepare(MyService, scope=SINGLETON)
+        a = parent.deliver(MyService)
+
+        child = parent.create()
+        b = child.deliver(MyService)
+
+        self.assertIsNot(a, b)
+        self.assertIs(b, child.deliver(MyService))
+
+    def test_should_raise_preparation_error_when_scope_unknown(self):
+        class MyService:
+            pass
+
+        injector = Injector()
+
+        with self.assertRaises(PreparationError):
+            injector.prepare(MyService, scope='session')
+
+
+class TestInjectorFinalization(unittest.TestCase):
+
+    def test_should_deliver_dependencies_when_finalized(self):
+        class MyService:
+            pass
+
+        class MyFacade:
+            def __init__(self, service: MyService):
+                self.service = service
+
+        injector = Injector()
+        injector.prepare(MyService)
+        injector.prepare(MyFacade)
+        injector.finalize()
+
+        facade = injector.deliver(MyFacade)
+        self.assertIsInstance(facade, MyFacade)
+        self.assertIsInstance(facade.service, MyService)
+
+    def test_should_raise_delivery_error_when_dependency_not_prepared(self):
+        class MyService:
+            pass
+
+        class MyFacade:
+            def __init__(self, service: MyService):
+                pass
+
+        injector = Injector()
+        injector.prepare(MyFacade)
+
+        with self.assertRaises(DeliveryError):
+            injector.finalize()
+
 
 class TestInject(unittest.TestCase):
 
@@ -326,6 +572,24 @@ class TestInject(unittest.TestCase):
         target = injector.inject(target, skip=2)
         self.assertIsInstance(target(1, 2), MyService)
 
+    def test_should_keep_target_metadata(self):
+        class Foo:
+            pass
+
+        def handler(foo: Foo):
+            return foo
+
+        async def async_handler(foo: Foo):
+            return foo
+
+        injector = Injector()
+        injector.prepare(Foo)
+
+        for target in [handler, async_handler]:
+            instrumented = injector.inject(target)
+            self.assertIs(target, instrumented.__wrapped__)
+            self.assertEqual(target.__name__, instrumented.__name__)
+
     def test_should_return_instrumented_coroutine_when_injecting_to_coroutine(self):
         class Foo:
             pass
@@ -419,6 +683,91 @@ class TestSequenceInjection(unittest.TestCase):
         self.assertIsInstance(services[0], GooglePayService)
         self.assertIsInstance(services[1], ApplePayService)
 
+    def test_should_deliver_list_with_many_dependencies(self):
+        class PaymentService:
+            pass
+
+        injector = Injector()
+        injector.prepare(PaymentService)
+        injector.prepare(List[PaymentService], [PaymentService] * 300)
+
+        services = injector.deliver(List[PaymentService])
+        self.assertEqual(len(services), 300)
+        self.assertIsInstance(services[-1], PaymentService)
+
+    def test_should_deliver_list_when_token_is_list_subclass(self):
+        class PaymentService(metaclass=ABCMeta):
+            pass
+
+        class GooglePayService(PaymentService):
+            pass
+
+        class ApplePayService(PaymentService):
+            pass
+
+        T = TypeVar('T')
+
+        class MyCollection(List[T]):
+            pass
+
+        injector = Injector()
+        injector.prepare(GooglePayService)
+        injector.prepare(ApplePayService)
+        injector.prepare(MyCollection[PaymentService], [GooglePayService, ApplePayService])
+
+        services = injector.deliver(MyCollection[PaymentService])
+        self.assertIsInstance(services, list)
+        self.assertEqual(len(services), 2)
+        self.assertIsInstance(services[0], GooglePayService)
+        self.assertIsInstance(services[1], ApplePayService)
+
+    @unittest.skipIf(sys.version_info < (3, 9), 'requires builtin generic aliases')
+    def test_should_deliver_sequence_when_prepared_again_with_equal_token(self):
+        class PaymentService(metaclass=ABCMeta):
+            pass
+
+        class GooglePayService(PaymentService):
+            pass
+
+        class ApplePayService(PaymentService):
+            pass
+
+        first_token = list[PaymentService]
+        second_token = list[PaymentService]
+        self.assertIsNot(first_token, second_token)
+
+        injector = Injector()
+        injector.prepare(GooglePayService)
+        injector.prepare(ApplePayService)
+        injector.prepare(first_token, [GooglePayService])
+        self.assertEqual(len(injector.deliver(second_token)), 1)
+
+        injector.prepare(second_token, [GooglePayService, ApplePayService])
+
+        for token in [first_token, second_token]:
+            services = injector.deliver(token)
+            self.assertEqual(len(services), 2)
+            self.assertIsInstance(services[0], GooglePayService)
+            self.assertIsInstance(services[1], ApplePayService)
+
+    @unittest.skipIf(sys.version_info < (3, 9), 'requires builtin generic aliases')
+    def test_should_compile_delivery_once_when_equal_token_built_again(self):
+        class PaymentService:
+            pass
+
+        class OtherService:
+            pass
+
+        injector = Injector()
+        injector.prepare(PaymentService)
+        injector.prepare(list[PaymentService], [PaymentService])
+
+        for _ in range(10):
+            self.assertEqual(len(injector.deliver(list[PaymentService])), 1)
+            self.assertIsNone(injector.deliver(list[OtherService], strict=False))
+
+        self.assertEqual(len(injector._deliveries), 1)
+
     def test_should_deliver_tuple_with_dependencies(self):
         class PaymentService(metaclass=ABCMeta):
             pass